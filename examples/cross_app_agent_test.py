@@ -3,6 +3,7 @@ import json
 import requests
 import uuid
 from dotenv import load_dotenv
+from jean_api_sdk.client import JeanClient
 
 # --- Configuration ---
 load_dotenv()
@@ -97,6 +98,19 @@ def run_cross_app_test():
 
     print("✅ Slack memory successfully retrieved.")
     print("✅ Jira memory successfully retrieved.")
+
+    # --- Step 5: The same lookup fanned out client-side, one sub-query per app ---
+    print(f"\nStep 5: Fanning out the search for '{ticket_id}' across slack and jira in parallel...")
+    # Same context (no X-Client-Name) and tool as steps 1-3, so only the fan-out differs.
+    fanout_client = JeanClient(token=API_KEY, client_name=None)
+    fanout_results = fanout_client.search_many(
+        ticket_id, source_app="slack,jira", tool="search_memories", per_source_quota=5, deadline=30
+    )
+    fanout_sources = {(res.get('metadata') or {}).get('source_app') for res in fanout_results['results']}
+    print(f"   -> {fanout_results['completed']}/{fanout_results['subqueries']} sub-queries completed"
+          + (" (partial)" if fanout_results['partial'] else ""))
+    assert {'slack', 'jira'} <= fanout_sources, f"Fan-out search missed a source: found {fanout_sources}"
+    print("✅ Fan-out search retrieved memories from both apps.")
     print("\\n🏆🏆🏆 Cross-Application Agent Test Successful! 🏆🏆🏆")
     print("The agent successfully retrieved linked memories from multiple sources.")
 
@@ -0,0 +1,355 @@
+import argparse
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+# --- Configuration ---
+API_KEY = os.environ.get("JEAN_API_KEY")
+API_URL = "https://jean-memory-api.onrender.com/agent/v1/mcp/messages/"
+REQUEST_TIMEOUT = 60
+MAX_IN_FLIGHT = 256  # Upper bound on concurrent requests; the generator never waits on responses
+
+# Default workload mix: fraction of arrivals per tool.
+DEFAULT_MIX = {
+    "add_memories": 0.6,
+    "search_memory": 0.3,
+    "ask_memory": 0.1,
+}
+
+# --- Workload Definition ---
+
+def build_arguments(tool, i):
+    """Build the tool arguments for the i-th synthetic request."""
+    if tool == "add_memories":
+        return {"text": f"Load test memory {i} - {uuid.uuid4().hex[:8]}"}
+    if tool == "search_memory":
+        return {"query": random.choice(["load test", "memory", "performance", "latency"])}
+    if tool == "ask_memory":
+        return {"question": "What do you know about load testing?"}
+    if tool == "list_memories":
+        return {"limit": 10}
+    if tool == "deep_memory_query":
+        return {"search_query": "Summarize everything about load testing."}
+    return {}
+
+def pick_tool(mix, rng):
+    """Pick a tool name according to the workload mix weights."""
+    tools = list(mix)
+    return rng.choices(tools, weights=[mix[t] for t in tools], k=1)[0]
+
+# --- Arrival Rate Profiles ---
+# Each profile returns a function rate(t) in requests/second for t seconds into the run.
+
+def constant_profile(rate):
+    return lambda t: rate
+
+def ramp_profile(start_rate, end_rate, duration):
+    return lambda t: start_rate + (end_rate - start_rate) * min(t / duration, 1.0)
+
+def step_profile(rates, step_duration):
+    return lambda t: rates[min(int(t // step_duration), len(rates) - 1)]
+
+def build_schedule(rate_fn, duration, mix, seed=None, poisson=True):
+    """
+    Precompute the intended send times for an open-loop run.
+
+    Returns a list of (offset_seconds, tool, arguments). Inter-arrival gaps are
+    drawn from an exponential distribution (Poisson arrivals) or kept uniform.
+    """
+    rng = random.Random(seed)
+    schedule = []
+    t = 0.0
+    i = 0
+    while True:
+        rate = rate_fn(t)
+        if rate <= 0:
+            t += 0.1
+            if t >= duration:
+                break
+            continue
+        t += rng.expovariate(rate) if poisson else 1.0 / rate
+        if t >= duration:
+            break
+        tool = pick_tool(mix, rng)
+        schedule.append((t, tool, build_arguments(tool, i)))
+        i += 1
+    return schedule
+
+def load_trace(path):
+    """
+    Load a JSONL trace to replay. Each line is
+    {"offset": <seconds from start>, "tool": <name>, "arguments": {...}}.
+    """
+    schedule = []
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            entry = json.loads(line)
+            schedule.append((float(entry["offset"]), entry["tool"], entry.get("arguments", {})))
+    schedule.sort(key=lambda e: e[0])
+    return schedule
+
+# --- Open-Loop Runner ---
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(int(round(pct / 100.0 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+def run_open_loop(schedule, url, headers, timeout=REQUEST_TIMEOUT, max_in_flight=MAX_IN_FLIGHT):
+    """
+    Fire each request at its scheduled time regardless of whether earlier
+    requests have completed.
+
+    Two latencies are recorded per request:
+      - service: measured from the moment the request was actually sent.
+      - corrected: measured from the moment it was *scheduled* to be sent.
+    The corrected latency accounts for coordinated omission: if the generator
+    (or its worker pool) falls behind, the queueing delay a real client would
+    have experienced is charged to the request instead of being hidden.
+    """
+    records = []
+    lock = threading.Lock()
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_in_flight)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+
+    def fire(i, intended, tool, args):
+        payload = {
+            "jsonrpc": "2.0", "id": i, "method": "tools/call",
+            "params": {"name": tool, "arguments": args}
+        }
+        sent = time.perf_counter()
+        error = None
+        try:
+            response = session.post(url, headers=headers, data=json.dumps(payload), timeout=timeout)
+            response.raise_for_status()
+            body = response.json()
+            if body.get("error"):
+                error = str(body["error"])
+        except Exception as e:
+            error = str(e)
+        done = time.perf_counter()
+        with lock:
+            records.append({
+                "tool": tool,
+                "intended": intended - start,
+                "completed": done - start,
+                "service": done - sent,
+                "corrected": done - intended,
+                "error": error,
+            })
+
+    start = time.perf_counter()
+    with session, ThreadPoolExecutor(max_workers=max_in_flight) as executor:
+        for i, (offset, tool, args) in enumerate(schedule):
+            intended = start + offset
+            delay = intended - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            executor.submit(fire, i, intended, tool, args)
+    elapsed = time.perf_counter() - start
+    return records, elapsed
+
+def summarize(records, window, offered_rate=None):
+    """
+    Aggregate per-request records into throughput and latency percentiles.
+
+    `window` is the length of the send window in seconds. Achieved throughput
+    counts successful completions in a window of that length starting at the
+    median service time, so the drain of the last requests does not count
+    against the server, but a growing backlog does.
+
+    Latency percentiles include failed and timed-out requests: dropping them
+    would hide exactly the tail the coordinated-omission correction exposes.
+    """
+    ok = [r for r in records if r["error"] is None]
+    service = sorted(r["service"] for r in records)
+    corrected = sorted(r["corrected"] for r in records)
+    window_start = percentile(sorted(r["service"] for r in ok), 50)
+    in_window = sum(1 for r in ok if window_start <= r["completed"] <= window_start + window)
+    summary = {
+        "requests": len(records),
+        "errors": len(records) - len(ok),
+        "error_ratio": (len(records) - len(ok)) / len(records) if records else 0.0,
+        "offered_rate": offered_rate if offered_rate is not None else len(records) / window if window else 0.0,
+        "achieved_rate": in_window / window if window else 0.0,
+        "by_tool": {},
+    }
+    for pct in (50, 90, 99):
+        summary[f"service_p{pct}"] = percentile(service, pct)
+        summary[f"corrected_p{pct}"] = percentile(corrected, pct)
+    for r in records:
+        summary["by_tool"][r["tool"]] = summary["by_tool"].get(r["tool"], 0) + 1
+    return summary
+
+def print_summary(label, summary):
+    print(f"   -> {label}: {summary['requests']} requests, {summary['errors']} errors, "
+          f"offered {summary['offered_rate']:.2f}/s, achieved {summary['achieved_rate']:.2f}/s")
+    print(f"      service   p50={summary['service_p50']*1000:.0f}ms p90={summary['service_p90']*1000:.0f}ms "
+          f"p99={summary['service_p99']*1000:.0f}ms")
+    print(f"      corrected p50={summary['corrected_p50']*1000:.0f}ms p90={summary['corrected_p90']*1000:.0f}ms "
+          f"p99={summary['corrected_p99']*1000:.0f}ms")
+
+# --- Saturation Knee Search ---
+
+def find_saturation_knee(url, headers, mix, rates, step_duration, latency_factor=3.0,
+                         throughput_ratio=0.9, max_error_ratio=0.01, seed=None):
+    """
+    Step the offered rate upward and report the last sustainable rate.
+
+    A step is considered saturated when the achieved rate falls below
+    `throughput_ratio` of the offered rate, more than `max_error_ratio` of its
+    requests fail, or its corrected p99 exceeds `latency_factor` times the
+    corrected p99 of the first step.
+    """
+    baseline_p99 = None
+    knee = None
+    steps = []
+    for rate in rates:
+        schedule = build_schedule(constant_profile(rate), step_duration, mix, seed=seed)
+        records, _ = run_open_loop(schedule, url, headers)
+        # Compare against the arrivals actually generated, not the nominal rate,
+        # so Poisson variance in a short step is not mistaken for saturation.
+        offered = len(schedule) / step_duration
+        summary = summarize(records, step_duration, offered_rate=offered)
+        steps.append(summary)
+        print_summary(f"{rate:.1f} req/s", summary)
+
+        if baseline_p99 is None:
+            baseline_p99 = summary["corrected_p99"] or 1e-3
+        saturated = (
+            summary["achieved_rate"] < throughput_ratio * offered
+            or summary["error_ratio"] > max_error_ratio
+            or summary["corrected_p99"] > latency_factor * baseline_p99
+        )
+        if saturated:
+            print(f"   -> Saturation detected at {rate:.1f} req/s")
+            break
+        knee = rate
+    return knee, steps
+
+# --- Local Stand-In Server ---
+
+def start_local_standin(service_time=0.05, capacity=4, port=0):
+    """
+    Start a local JSON-RPC stand-in for the memory API.
+
+    Each request holds one of `capacity` slots for `service_time` seconds, so
+    the stand-in saturates at roughly capacity / service_time requests/second.
+    Returns (server, url).
+    """
+    slots = threading.Semaphore(capacity)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            request = json.loads(body or b"{}")
+            with slots:
+                time.sleep(service_time)
+            tool = request.get("params", {}).get("name")
+            result = {"content": [{"type": "text", "text": f"ok: {tool}"}], "results": []}
+            data = json.dumps({"jsonrpc": "2.0", "id": request.get("id"), "result": result}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # The client gave up (timed out) before the response was ready
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+# --- Entry Point ---
+
+def parse_mix(spec):
+    """Parse a mix like 'add_memories=0.6,search_memory=0.3,ask_memory=0.1'."""
+    mix = {}
+    for part in spec.split(","):
+        tool, weight = part.split("=")
+        mix[tool.strip()] = float(weight)
+    return mix
+
+def run_load_test():
+    parser = argparse.ArgumentParser(description="Open-loop load generator for the Jean Memory API.")
+    parser.add_argument("--target", choices=["local", "live"], default="local")
+    parser.add_argument("--profile", choices=["constant", "ramp", "step", "knee"], default="constant")
+    parser.add_argument("--rate", type=float, default=20.0, help="Constant rate, or ramp end rate (req/s)")
+    parser.add_argument("--start-rate", type=float, default=1.0, help="Ramp start rate (req/s)")
+    parser.add_argument("--rates", default="10,20,40,60,80,100,120", help="Comma-separated step/knee rates")
+    parser.add_argument("--step-duration", type=float, default=5.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    parser.add_argument("--mix", default=None, help="e.g. add_memories=0.6,search_memory=0.3,ask_memory=0.1")
+    parser.add_argument("--trace", default=None, help="JSONL trace to replay instead of a synthetic profile")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    if args.profile == "knee" and args.trace:
+        parser.error("--trace cannot be combined with --profile knee")
+
+    mix = parse_mix(args.mix) if args.mix else DEFAULT_MIX
+    rates = [float(r) for r in args.rates.split(",")]
+
+    if args.target == "live":
+        if not API_KEY:
+            raise ValueError("JEAN_API_KEY environment variable not set!")
+        url = API_URL
+        headers = {
+            "Authorization": f"Bearer {API_KEY}",
+            "Content-Type": "application/json",
+            "X-Client-Name": f"loadgen-{uuid.uuid4().hex[:6]}",
+        }
+    else:
+        _, url = start_local_standin()
+        headers = {"Content-Type": "application/json"}
+
+    print("🚀 OPEN-LOOP LOAD GENERATOR")
+    print(f"   Target: {args.target} ({url})")
+    print(f"   Mix: {mix}")
+    print("=" * 80)
+
+    if args.profile == "knee":
+        knee, _ = find_saturation_knee(url, headers, mix, rates, args.step_duration, seed=args.seed)
+        if knee is None:
+            print("💥 Saturated at the first step; lower --rates to find the knee.")
+        else:
+            print(f"🎯 Last sustainable rate: {knee:.1f} req/s")
+        return
+
+    if args.trace:
+        schedule = load_trace(args.trace)
+        duration = schedule[-1][0] if schedule else 0.0
+        label = f"trace {args.trace}"
+    else:
+        if args.profile == "constant":
+            rate_fn, duration = constant_profile(args.rate), args.duration
+        elif args.profile == "ramp":
+            rate_fn, duration = ramp_profile(args.start_rate, args.rate, args.duration), args.duration
+        else:
+            rate_fn, duration = step_profile(rates, args.step_duration), args.step_duration * len(rates)
+        schedule = build_schedule(rate_fn, duration, mix, seed=args.seed)
+        label = f"{args.profile} profile"
+
+    records, elapsed = run_open_loop(schedule, url, headers)
+    window = duration or elapsed
+    print_summary(label, summarize(records, window, offered_rate=len(schedule) / window if window else None))
+
+if __name__ == "__main__":
+    run_load_test()
@@ -54,16 +54,13 @@ class AnalystAgent:
         time.sleep(2) 
         
         print("  - [Analyst] Listing all memories in the current context...")
-        search_result = self.client.list_memories(limit=100)
+        search_result = self.client.list_memory_results(limit=100)
         
-        if not search_result or not search_result.get("results"):
+        if not search_result:
             print("  - [Analyst] No memories found.")
             return "No analysis could be generated as no memories were found."
 
-        facts = [
-            res.get("memory", "") for res in search_result["results"]
-            if "Fact about" in res.get("memory", "")
-        ]
+        facts = search_result.texts_containing("Fact about")
         if not facts:
             print("  - [Analyst] No 'Fact about' memories found in the list.")
             return "No analysis could be generated as no facts were found."
@@ -87,16 +84,13 @@ class ExecutiveAgent:
         time.sleep(2)
 
         print("  - [Executive] Listing memories to find the final analysis...")
-        search_result = self.client.list_memories(limit=100)
+        search_result = self.client.list_memory_results(limit=100)
         
-        if not search_result or not search_result.get("results"):
+        if not search_result:
             print("  - [Executive] No analysis found. Cannot make a decision.")
             return "No decision could be made."
 
-        analysis_list = [
-            res.get("memory", "") for res in search_result["results"]
-            if "ANALYSIS:" in res.get("memory", "")
-        ]
+        analysis_list = search_result.texts_containing("ANALYSIS:")
         if not analysis_list:
             print("  - [Executive] No analysis found in memory list.")
             return "No decision could be made."
@@ -156,14 +150,13 @@ def run_advanced_strategy_test():
         print("\\n" + "-"*80)
         print("🕵️ [Orchestrator] Validating final results from memory...")
         time.sleep(2) 
-        all_memories = swarm_client.list_memories(limit=100)
+        all_memories = swarm_client.list_memory_results(limit=100)
         
         final_decision_from_memory_text = None
-        if all_memories and all_memories.get('results'):
-            for mem in all_memories['results']:
-                if "FINAL DECISION:" in mem.get('memory', ''):
-                    final_decision_from_memory_text = mem.get('memory', '')
-                    break
+        if all_memories:
+            final_decision = all_memories.first_containing("FINAL DECISION:")
+            if final_decision:
+                final_decision_from_memory_text = final_decision.memory
         
         assert final_decision_from_memory_text, "Could not retrieve final decision from memory."
         assert "key market differentiators" in final_decision_from_memory_text, "Final decision content is incorrect."
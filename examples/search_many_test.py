@@ -0,0 +1,134 @@
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from jean_api_sdk.client import JeanClient
+
+# --- Local Stand-In Search Server ---
+
+# Per-source latency in seconds; "github" is slower than any deadline used below.
+SOURCE_LATENCY = {"slack": 0.05, "jira": 0.2, "github": 3.0}
+
+# Per-source hits as (id, score). "shared-1" is returned by both slack and jira
+# with different scores; jira hits carry `"metadata": null`.
+SOURCE_HITS = {
+    "slack": [("shared-1", 0.5), ("slack-1", 0.8), ("slack-2", 0.7), ("slack-3", 0.6)],
+    "jira": [("shared-1", 0.9), ("jira-1", 0.85), ("jira-2", 0.4), ("jira-3", 0.3)],
+    "github": [("github-1", 0.99)],
+}
+
+def build_hits(source):
+    hits = []
+    for memory_id, score in SOURCE_HITS.get(source, []):
+        metadata = {"source_app": source} if source == "slack" else None
+        hits.append({"id": memory_id, "memory": f"{memory_id} from {source}", "score": score,
+                     "metadata": metadata})
+    return hits
+
+def start_search_standin():
+    """
+    Start a local JSON-RPC stand-in that answers search tool calls per `source_app`
+    after that source's latency. The "broken" source answers with a 500.
+    Returns (server, url).
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            source = request["params"]["arguments"].get("source_app")
+            if source == "broken":
+                self.send_response(500)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            time.sleep(SOURCE_LATENCY.get(source, 0))
+            result = {"results": build_hits(source)}
+            data = json.dumps({"jsonrpc": "2.0", "id": request.get("id"), "result": result}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            try:
+                self.wfile.write(data)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # The client stopped waiting past its deadline
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}/"
+
+# --- Test ---
+
+def run_search_many_test():
+    print("=" * 80)
+    print("🔬 RUNNING FAN-OUT SEARCH TEST (local stand-in) 🔬")
+    print("=" * 80)
+
+    server, url = start_search_standin()
+    client = JeanClient(token="local-stand-in", client_name=f"fanout-test-{uuid.uuid4().hex[:6]}")
+    client.base_url = url
+
+    # 1. Duplicates across sources are merged, keeping the highest score, and ranked.
+    merged = client.search_many("roadmap", source_app="slack,jira")
+    ids = [hit["id"] for hit in merged["results"]]
+    assert len(ids) == len(set(ids)) == 7, f"Duplicates were not merged: {ids}"
+    shared = next(hit for hit in merged["results"] if hit["id"] == "shared-1")
+    assert shared["score"] == 0.9, f"Dedupe kept score {shared['score']} instead of the max."
+    scores = [hit["score"] for hit in merged["results"]]
+    assert scores == sorted(scores, reverse=True), f"Results are not ranked by score: {scores}"
+    assert not merged["partial"] and merged["completed"] == 2 and merged["failed"] == 0
+    print("  ✅ Duplicate hits merged with the max score and ranked.")
+
+    # 2. The per-source quota holds, counting hits without metadata under their sub-query's source.
+    quota = client.search_many("roadmap", source_app="slack,jira", per_source_quota=2)
+    by_source = {}
+    for hit in quota["results"]:
+        source = hit["memory"].rsplit(" from ", 1)[1]
+        by_source[source] = by_source.get(source, 0) + 1
+    assert by_source == {"slack": 2, "jira": 2}, f"Quota not applied per source: {by_source}"
+    assert [hit["id"] for hit in quota["results"]] == ["shared-1", "jira-1", "slack-1", "slack-2"], \
+        f"Unexpected quota selection: {[hit['id'] for hit in quota['results']]}"
+    print("  ✅ Per-source quota applied, with metadata-less hits counted under their sub-query.")
+
+    # 3. top_k truncates, and non-positive values return nothing.
+    assert len(client.search_many("roadmap", source_app="slack,jira", top_k=3)["results"]) == 3
+    assert client.search_many("roadmap", source_app="slack,jira", top_k=0)["results"] == []
+    print("  ✅ top_k truncates results and top_k=0 returns none.")
+
+    # 4. A slow source past the deadline yields a partial result without waiting for it.
+    started = time.time()
+    partial = client.search_many("roadmap", source_app="slack,jira,github", deadline=1.0)
+    elapsed = time.time() - started
+    assert elapsed < SOURCE_LATENCY["github"] - 1, f"Deadline was not honored ({elapsed:.2f}s)."
+    assert partial["partial"] and partial["subqueries"] == 3 and partial["completed"] == 2, \
+        f"Unexpected partial bookkeeping: {partial}"
+    assert "github-1" not in {hit["id"] for hit in partial["results"]}
+    print(f"  ✅ Deadline returned {partial['completed']}/{partial['subqueries']} sub-queries "
+          f"as partial after {elapsed:.2f}s.")
+
+    # 5. A failing source is counted and does not sink the others.
+    failing = client.search_many("roadmap", source_app="slack,broken")
+    assert failing["failed"] == 1 and failing["completed"] == 1 and not failing["partial"], \
+        f"Unexpected failure bookkeeping: {failing}"
+    assert len(failing["results"]) == 4, "Results from the healthy source were dropped."
+    print("  ✅ Failed sub-query counted while the healthy source was still merged.")
+
+    # 6. Degenerate input.
+    assert client.search_many([])["subqueries"] == 0
+    try:
+        client.search_many("roadmap", max_workers=0)
+        raise AssertionError("max_workers=0 was accepted.")
+    except ValueError:
+        pass
+    print("  ✅ Empty input returns no sub-queries and max_workers=0 is rejected.")
+
+    server.shutdown()
+    print("\n🏆 SUCCESS: Fan-out search merged, capped and bounded its sub-queries.")
+
+if __name__ == "__main__":
+    run_search_many_test()
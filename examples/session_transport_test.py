@@ -0,0 +1,324 @@
+import json
+import random
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import requests
+
+from jean_api_sdk.client import JeanClient
+
+# --- Local Stand-In MCP SSE Server ---
+
+class StandInState:
+    """Per-server bookkeeping: buffered events per session so streams can be resumed."""
+    def __init__(self, session_id_in_query=True, required_token=None, post_response="accepted"):
+        self.session_id_in_query = session_id_in_query
+        self.required_token = required_token
+        self.post_response = post_response
+        self.sessions = {}
+        self.forgotten = set()
+        self.methods = {}
+        self.lock = threading.Lock()
+        self.stream_opens = 0
+        self.initialize_calls = 0
+
+    def session(self, session_id):
+        with self.lock:
+            if session_id not in self.sessions:
+                self.sessions[session_id] = {"events": [], "cond": threading.Condition(), "drop": False}
+            return self.sessions[session_id]
+
+    def push(self, session_id, message):
+        session = self.session(session_id)
+        with session["cond"]:
+            event_id = str(len(session["events"]) + 1)
+            session["events"].append((event_id, json.dumps(message)))
+            session["cond"].notify_all()
+
+    def record(self, session_id, method):
+        with self.lock:
+            self.methods.setdefault(session_id, []).append(method)
+
+    def forget(self, session_id):
+        """Refuse to resume a session, as a restarted server would."""
+        with self.lock:
+            self.forgotten.add(session_id)
+        self.drop_stream(session_id)
+
+    def drop_stream(self, session_id):
+        """Force the open stream for a session to disconnect."""
+        session = self.session(session_id)
+        with session["cond"]:
+            session["drop"] = True
+            session["cond"].notify_all()
+
+def handle_message(state, message, emit):
+    """Answer one JSON-RPC message, passing each outgoing message to `emit`."""
+    method = message.get("method")
+    request_id = message.get("id")
+    params = message.get("params", {})
+    if request_id is None:
+        return  # Notification
+    if params.get("name") == "never_answer":
+        return
+
+    if method == "initialize":
+        with state.lock:
+            state.initialize_calls += 1
+        result = {
+            "protocolVersion": params.get("protocolVersion"),
+            "capabilities": {"tools": {}},
+            "serverInfo": {"name": "stand-in", "version": "0.1"},
+        }
+    elif method == "tools/call" and params.get("name") == "deep_memory_query":
+        token = params.get("_meta", {}).get("progressToken")
+        for step in range(1, 4):
+            time.sleep(0.3)
+            if token is not None:
+                emit({
+                    "jsonrpc": "2.0", "method": "notifications/progress",
+                    "params": {"progressToken": token, "progress": step, "total": 3},
+                })
+        result = {"content": [{"type": "text", "text": "Deep analysis complete."}]}
+    elif method == "tools/call":
+        time.sleep(random.uniform(0, 0.2))  # Finish out of order to exercise multiplexing
+        result = {"content": [{"type": "text", "text": json.dumps(params.get("arguments", {}))}]}
+    else:
+        emit({"jsonrpc": "2.0", "id": request_id,
+              "error": {"code": -32601, "message": f"Method not found: {method}"}})
+        return
+    emit({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+def start_standin_server(session_id_in_query=True, required_token=None, post_response="accepted"):
+    """
+    Start the stand-in server in a background thread. Returns (server, state, sse_url).
+    With `session_id_in_query` off, the session id is only sent in the Mcp-Session-Id header.
+    With `required_token` set, the stream is refused with 401 for any other bearer token.
+    `post_response` selects how tool calls are answered: "accepted" (202, reply on the
+    stream), "stream" (an SSE response body on the POST) or "text" (an unexpected body).
+    """
+    state = StandInState(session_id_in_query, required_token, post_response)
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def write_chunk(self, text):
+            data = text.encode()
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+
+        def do_GET(self):
+            if state.required_token and self.headers.get("Authorization") != f"Bearer {state.required_token}":
+                with state.lock:
+                    state.stream_opens += 1
+                self.send_response(401)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            session_id = self.headers.get("Mcp-Session-Id")
+            cursor = int(self.headers.get("Last-Event-ID") or 0)
+            if not session_id or session_id in state.forgotten:
+                session_id, cursor = uuid.uuid4().hex, 0
+            session = state.session(session_id)
+            with state.lock:
+                state.stream_opens += 1
+
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Mcp-Session-Id", session_id)
+            self.end_headers()
+            endpoint = f"/messages/?session_id={session_id}" if state.session_id_in_query else "/messages/"
+            self.write_chunk(f"event: endpoint\ndata: {endpoint}\n\n")
+
+            try:
+                while True:
+                    with session["cond"]:
+                        while cursor >= len(session["events"]) and not session["drop"]:
+                            session["cond"].wait(0.5)
+                        if session["drop"]:
+                            session["drop"] = False
+                            break
+                        pending = session["events"][cursor:]
+                        cursor = len(session["events"])
+                    for event_id, data in pending:
+                        self.write_chunk(f"id: {event_id}\nevent: message\ndata: {data}\n\n")
+                self.wfile.write(b"0\r\n\r\n")
+            except (BrokenPipeError, ConnectionResetError):
+                pass
+            self.close_connection = True
+
+        def do_POST(self):
+            session_id = (parse_qs(urlparse(self.path).query).get("session_id", [None])[0]
+                          or self.headers.get("Mcp-Session-Id"))
+            message = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            state.record(session_id, message.get("method"))
+            inline = message.get("method") == "tools/call" and message.get("id") is not None
+            if inline and state.post_response == "stream":
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                handle_message(state, message, lambda m: self.write_chunk(f"event: message\ndata: {json.dumps(m)}\n\n"))
+                self.wfile.write(b"0\r\n\r\n")
+                return
+            if inline and state.post_response == "text":
+                body = b"queued"
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+                return
+            emit = lambda m: state.push(session_id, m)
+            threading.Thread(target=handle_message, args=(state, message, emit), daemon=True).start()
+            self.send_response(202)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, state, f"http://127.0.0.1:{server.server_address[1]}/sse"
+
+# --- Test ---
+
+def wait_for(condition, timeout=10):
+    deadline = time.time() + timeout
+    while not condition():
+        if time.time() > deadline:
+            raise AssertionError("Timed out waiting for the stand-in server.")
+        time.sleep(0.05)
+
+def run_session_transport_test():
+    print("=" * 80)
+    print("🔬 RUNNING MCP SESSION TRANSPORT TEST (local stand-in) 🔬")
+    print("=" * 80)
+
+    server, state, sse_url = start_standin_server()
+    client = JeanClient(token="local-stand-in", client_name=f"session-test-{uuid.uuid4().hex[:6]}")
+    session = client.connect_session(sse_url)
+    print(f"  - Connected. Session: {session.session_id}")
+
+    # 1. Many concurrent calls multiplexed over the one stream.
+    texts = [f"Multiplexed memory {i}" for i in range(50)]
+    with ThreadPoolExecutor(max_workers=25) as executor:
+        results = list(executor.map(client.add_memory, texts))
+    echoed = [json.loads(r["content"][0]["text"])["text"] for r in results]
+    assert echoed == texts, "Responses were not matched to their requests."
+    print(f"  ✅ {len(texts)} concurrent calls each received their own response.")
+
+    # 2. Long-running call with progress, surviving a dropped stream.
+    progress = []
+    dropper = threading.Timer(0.45, state.drop_stream, args=(session.session_id,))
+    dropper.start()
+    result = client.deep_memory_query("Summarize everything.", on_progress=progress.append)
+    assert result and "complete" in result["content"][0]["text"], "Deep query did not complete."
+    assert [p["progress"] for p in progress] == [1, 2, 3], f"Unexpected progress updates: {progress}"
+    assert state.stream_opens >= 2, "Stream was never reconnected."
+    print(f"  ✅ Deep query completed with {len(progress)} progress updates across a reconnect.")
+
+    # 3. The handshake ran once for the whole session.
+    assert state.initialize_calls == 1, f"initialize ran {state.initialize_calls} times."
+    print("  ✅ initialize handshake performed exactly once.")
+
+    # 4. A call that times out is cleaned up instead of leaking.
+    try:
+        session.call("tools/call", {"name": "never_answer", "arguments": {}}, timeout=0.3)
+        raise AssertionError("Call without a response did not time out.")
+    except TimeoutError:
+        pass
+    assert not session._pending and not session._progress, "Timed-out call was left pending."
+    print("  ✅ Timed-out call raised TimeoutError and was removed from the pending table.")
+
+    # 5. A session the server will not resume is re-initialized before any other call.
+    old_session_id = session.session_id
+    opens = state.stream_opens
+    state.forget(old_session_id)
+    wait_for(lambda: state.stream_opens > opens)
+    result = client.add_memory("Written after the session was replaced")
+    assert result, "Call after session replacement failed."
+    new_methods = state.methods[session.session_id]
+    assert session.session_id != old_session_id, "Session id did not change."
+    assert new_methods[:3] == ["initialize", "notifications/initialized", "tools/call"], \
+        f"Calls reached the new session before the handshake: {new_methods}"
+    print("  ✅ Replaced session completed its handshake before serving calls.")
+
+    client.close_session()
+    server.shutdown()
+
+    # 6. A server that only sends the session id in a header is resumed, not re-initialized.
+    server, state, sse_url = start_standin_server(session_id_in_query=False)
+    client = JeanClient(token="local-stand-in", client_name=f"session-test-{uuid.uuid4().hex[:6]}")
+    session = client.connect_session(sse_url)
+    opens = state.stream_opens
+    state.drop_stream(session.session_id)
+    wait_for(lambda: state.stream_opens > opens)
+    assert client.add_memory("Written after a header-only resume"), "Call after header-only resume failed."
+    assert state.initialize_calls == 1, f"Header-only session was re-initialized {state.initialize_calls} times."
+    print("  ✅ Header-only session id was resumed without a new handshake.")
+
+    # 7. A progress callback that raises does not tear down the stream.
+    opens = state.stream_opens
+    def failing_callback(update):
+        raise ValueError("callback bug")
+    result = client.deep_memory_query("Summarize with a broken callback.", on_progress=failing_callback)
+    assert result and "complete" in result["content"][0]["text"], "Deep query failed with a raising callback."
+    assert state.stream_opens == opens, "A raising progress callback reconnected the stream."
+    print("  ✅ Raising progress callback was contained without a reconnect.")
+
+    client.close_session()
+    server.shutdown()
+
+    # 8. Rejected credentials fail connect() with the HTTP error and stop the reader.
+    server, state, sse_url = start_standin_server(required_token="expected-token")
+    client = JeanClient(token="wrong-token", client_name=f"session-test-{uuid.uuid4().hex[:6]}")
+    started = time.time()
+    try:
+        client.connect_session(sse_url)
+        raise AssertionError("connect() succeeded with rejected credentials.")
+    except requests.HTTPError as e:
+        assert e.response.status_code == 401, f"Unexpected status: {e.response.status_code}"
+    assert time.time() - started < 5, "Rejected connect was not reported promptly."
+    opens = state.stream_opens
+    time.sleep(1)
+    assert state.stream_opens == opens == 1, f"Reader kept reconnecting after a 401 ({state.stream_opens} GETs)."
+    print("  ✅ 401 on the stream raised HTTPError from connect() and stopped the reader.")
+    server.shutdown()
+
+    # 9. A POST answered with an SSE body delivers its progress and result.
+    server, state, sse_url = start_standin_server(post_response="stream")
+    client = JeanClient(token="local-stand-in", client_name=f"session-test-{uuid.uuid4().hex[:6]}")
+    client.connect_session(sse_url)
+    progress = []
+    result = client.deep_memory_query("Summarize over the POST stream.", on_progress=progress.append)
+    assert result and "complete" in result["content"][0]["text"], "SSE POST response was not delivered."
+    assert [p["progress"] for p in progress] == [1, 2, 3], f"Unexpected progress updates: {progress}"
+    print("  ✅ text/event-stream POST response delivered progress and the result.")
+    client.close_session()
+    server.shutdown()
+
+    # 10. An unexpected POST response body fails the call instead of being dropped.
+    server, state, sse_url = start_standin_server(post_response="text")
+    client = JeanClient(token="local-stand-in", client_name=f"session-test-{uuid.uuid4().hex[:6]}")
+    session = client.connect_session(sse_url)
+    try:
+        session.call("tools/call", {"name": "add_memory", "arguments": {"text": "x"}}, timeout=5)
+        raise AssertionError("Unexpected POST response was silently accepted.")
+    except ConnectionError:
+        pass
+    assert not session._pending, "Failed call was left pending."
+    print("  ✅ Unexpected POST content type raised instead of being discarded.")
+    client.close_session()
+    server.shutdown()
+    print("\n🏆 SUCCESS: One persistent session served every call.")
+
+if __name__ == "__main__":
+    run_session_transport_test()
@@ -1,13 +1,19 @@
 import os
 import json
+import itertools
 import requests
-from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, Any, Optional, Callable, List, Union
+
+from jean_api_sdk.results import MemoryResultSet
+from jean_api_sdk.session import MCPSession, MCPError
 
 class JeanClient:
     """
     A simple Python client for the Jean Memory Agent REST API.
     """
-    def __init__(self, token: Optional[str] = None, client_name: str = "default-agent"):
+    def __init__(self, token: Optional[str] = None, client_name: Optional[str] = "default-agent",
+                 timeout: float = 120):
         self.api_token = token or os.environ.get("JEAN_API_KEY")
         if not self.api_token:
             raise ValueError("API Key not found. Pass it to the constructor or set JEAN_API_KEY.")
@@ -16,19 +22,54 @@ class JeanClient:
         self.headers = {
             "Authorization": f"Bearer {self.api_token}",
             "Content-Type": "application/json",
-            "X-Client-Name": client_name,
         }
+        # Without a client name, requests use the account's default memory context.
+        if client_name is not None:
+            self.headers["X-Client-Name"] = client_name
+        self.client_name = client_name
+        # Per-call timeout in seconds; long enough for `deep_memory_query`.
+        self.timeout = timeout
+        self.session: Optional[MCPSession] = None
+        self._ids = itertools.count(1)
+
+    def connect_session(self, sse_url: str) -> MCPSession:
+        """
+        Opens a persistent MCP session on an SSE endpoint (e.g. `/mcp/claude/sse/<id>`).
+        Subsequent calls are multiplexed over it instead of one POST per call.
+        """
+        self.close_session()
+        self.session = MCPSession(sse_url, headers=self.headers,
+                                  client_name=self.client_name or "jean-api-sdk").connect()
+        return self.session
+
+    def close_session(self):
+        """Closes the persistent session, if any, and falls back to one-shot POSTs."""
+        if self.session is not None:
+            self.session.close()
+            self.session = None
 
-    def _make_request(self, method: str, params: Dict[str, Any]) -> Optional[Dict]:
+    def _make_request(self, method: str, params: Dict[str, Any],
+                      on_progress: Optional[Callable[[Dict], None]] = None) -> Optional[Dict]:
         """Helper to construct and send a JSON-RPC 2.0 request."""
+        if self.session is not None:
+            try:
+                return self.session.call(method, params, timeout=self.timeout, on_progress=on_progress)
+            except MCPError as err:
+                print(f"❌ API Error for method '{method}': {err}")
+                return None
+            except Exception as e:
+                print(f"An unexpected error occurred: {e}")
+                return None
+
         payload = {
             "jsonrpc": "2.0",
             "method": method,
             "params": params,
-            "id": 1 
+            "id": next(self._ids)
         }
         try:
-            response = requests.post(self.base_url, headers=self.headers, data=json.dumps(payload))
+            response = requests.post(self.base_url, headers=self.headers, data=json.dumps(payload),
+                                     timeout=self.timeout)
             response.raise_for_status()
             return response.json().get("result")
         except requests.exceptions.HTTPError as err:
@@ -55,6 +96,89 @@ class JeanClient:
             "arguments": {"query": query}
         })
 
+    def search_many(self, queries: Union[str, List[str]], source_app: Optional[str] = None,
+                    top_k: int = 20, per_source_quota: Optional[int] = None,
+                    deadline: Optional[float] = None, max_workers: int = 8,
+                    tool: str = "search_memory") -> Dict:
+        """
+        Fans a search out into parallel sub-queries and merges the results.
+
+        Every query is run once per source in a comma-separated `source_app`
+        filter (e.g. "slack,jira"), all concurrently. Hits are deduplicated by
+        memory id (keeping the highest score), ranked by score, capped at
+        `per_source_quota` hits per source, and truncated to `top_k`. If
+        `deadline` seconds pass first, whatever has completed is merged and
+        returned with `partial` set. `tool` names the search tool to call.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        queries = [queries] if isinstance(queries, str) else list(queries)
+        sources = [s.strip() for s in (source_app or "").split(",") if s.strip()] or [None]
+        subqueries = [(q, src) for q in queries for src in sources]
+        if not subqueries or top_k <= 0:
+            return {"results": [], "partial": False, "subqueries": 0, "completed": 0, "failed": 0}
+        print(f"🤔 Searching {len(queries)} quer{'y' if len(queries) == 1 else 'ies'} "
+              f"across {len(subqueries)} sub-queries...")
+
+        def run(query: str, source: Optional[str]) -> Optional[Dict]:
+            arguments = {"query": query}
+            if source:
+                arguments["source_app"] = source
+            return self._make_request("tools/call", {"name": tool, "arguments": arguments})
+
+        executor = ThreadPoolExecutor(max_workers=min(max_workers, len(subqueries)))
+        futures = {executor.submit(run, q, src): src for q, src in subqueries}
+        done, not_done = wait(futures, timeout=deadline)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        def rank(item: Dict) -> float:
+            score = item.get("score")
+            return score if score is not None else float("-inf")
+
+        best: Dict[Any, Dict] = {}
+        sources_by_key: Dict[Any, Optional[str]] = {}
+        failed = 0
+        for future in done:
+            result = future.result()
+            if result is None:
+                failed += 1
+                continue
+            for item in result.get("results") or []:
+                key = item.get("id") or item.get("memory")
+                if key not in best or rank(item) > rank(best[key]):
+                    best[key] = item
+                    sources_by_key[key] = (item.get("metadata") or {}).get("source_app") or futures[future]
+
+        merged, per_source = [], {}
+        for key in sorted(best, key=lambda k: rank(best[k]), reverse=True):
+            if len(merged) >= top_k:
+                break
+            item, item_source = best[key], sources_by_key[key]
+            if per_source_quota is not None and per_source.get(item_source, 0) >= per_source_quota:
+                continue
+            per_source[item_source] = per_source.get(item_source, 0) + 1
+            merged.append(item)
+
+        return {
+            "results": merged,
+            "partial": bool(not_done),
+            "subqueries": len(subqueries),
+            "completed": len(done) - failed,
+            "failed": failed,
+        }
+
+    def deep_memory_query(self, search_query: str,
+                          on_progress: Optional[Callable[[Dict], None]] = None) -> Optional[Dict]:
+        """
+        Runs a long-running deep query. With a session open, `on_progress` receives
+        the server's progress notifications while the query runs.
+        """
+        print(f"🔬 Deep query: '{search_query}'")
+        return self._make_request("tools/call", {
+            "name": "deep_memory_query",
+            "arguments": {"search_query": search_query}
+        }, on_progress=on_progress)
+
     def list_tools(self) -> Optional[Dict]:
         """Lists available tools."""
         print("🛠️ Listing available tools...")
@@ -66,4 +190,14 @@ class JeanClient:
         return self._make_request("tools/call", {
             "name": "list_memories",
             "arguments": {"limit": limit}
-        }) 
\ No newline at end of file
+        }) 
+
+    def search_memory_results(self, query: str) -> Optional[MemoryResultSet]:
+        """Searches for memories and returns the hits as a MemoryResultSet."""
+        result = self.search_memories(query)
+        return MemoryResultSet.from_result(result) if result is not None else None
+
+    def list_memory_results(self, limit: int = 20) -> Optional[MemoryResultSet]:
+        """Lists recent memories and returns them as a MemoryResultSet."""
+        result = self.list_memories(limit)
+        return MemoryResultSet.from_result(result) if result is not None else None
@@ -0,0 +1,193 @@
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+_HOT_FIELDS = ("id", "memory", "score", "metadata")
+_SHARED_VALUE_MAX_LEN = 64
+
+def _unpack(packed: Optional[Tuple]) -> Dict[str, Any]:
+    return dict(zip(packed[::2], packed[1::2])) if packed else {}
+
+def _lookup(packed: Optional[Tuple], key: str, default: Any = None) -> Any:
+    if packed:
+        for i in range(0, len(packed), 2):
+            if packed[i] == key:
+                return packed[i + 1]
+    return default
+
+class MemoryHit:
+    """
+    A lightweight view onto one row of a MemoryResultSet.
+
+    Hits hold no data of their own; every field is read from the parent set's
+    columns. Fields other than id/memory/score/metadata are unpacked from the
+    row's packed tuples only when asked for, and `metadata` builds a fresh dict
+    on each access.
+    """
+    __slots__ = ("_set", "_index")
+
+    def __init__(self, result_set: "MemoryResultSet", index: int):
+        self._set = result_set
+        self._index = index
+
+    @property
+    def id(self) -> Optional[str]:
+        return self._set._ids[self._index]
+
+    @property
+    def memory(self) -> str:
+        return self._set._memories[self._index]
+
+    @property
+    def score(self) -> Optional[float]:
+        return self._set._scores[self._index]
+
+    @property
+    def metadata(self) -> Dict[str, Any]:
+        return _unpack(self._set._metadata[self._index])
+
+    @property
+    def source_app(self) -> Optional[str]:
+        return _lookup(self._set._metadata[self._index], "source_app")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Dict-style access, so existing `res.get("memory", "")` callers keep working."""
+        if key in _HOT_FIELDS:
+            value = getattr(self, key)
+            return default if value is None else value
+        return _lookup(self._set._extras[self._index], key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materializes this hit as a new dict in the server's response shape."""
+        data = _unpack(self._set._extras[self._index])
+        data["memory"] = self.memory
+        if self.id is not None:
+            data["id"] = self.id
+        if self.score is not None:
+            data["score"] = self.score
+        if self._set._metadata[self._index] is not None:
+            data["metadata"] = self.metadata
+        return data
+
+    def __repr__(self) -> str:
+        return f"MemoryHit(id={self.id!r}, memory={self.memory[:40]!r})"
+
+class MemoryResultSet:
+    """
+    Compact, column-oriented container for `list_memories`/`search_memory` results.
+
+    `id`, `memory` and `score` are stored as parallel lists. `metadata` and any
+    other fields of a hit are packed into flat (key, value, ...) tuples and
+    only unpacked when read, and short string values repeated across hits
+    (source apps, user ids, ...) are stored once. The per-hit dicts from the
+    response are not kept, so once the decoded response is dropped a listing
+    holds a few flat lists instead of two dicts per hit. Text filters run
+    directly over the `memory` column.
+    """
+    __slots__ = ("_ids", "_memories", "_scores", "_metadata", "_extras")
+
+    def __init__(self, ids: List[Optional[str]], memories: List[str], scores: List[Optional[float]],
+                 metadata: List[Optional[Tuple]], extras: List[Optional[Tuple]]):
+        self._ids = ids
+        self._memories = memories
+        self._scores = scores
+        self._metadata = metadata
+        self._extras = extras
+
+    @classmethod
+    def from_result(cls, result: Optional[Dict]) -> "MemoryResultSet":
+        """Builds a result set from a tool call result containing a `results` list."""
+        items = (result or {}).get("results") or []
+        share = {}.setdefault
+        hot = frozenset(_HOT_FIELDS)
+        no_skip = frozenset()
+
+        def pack(pairs, skip) -> Optional[Tuple]:
+            flat = []
+            for k, v in pairs:
+                if k in skip:
+                    continue
+                if v.__class__ is str and len(v) <= _SHARED_VALUE_MAX_LEN:
+                    v = share(v, v)
+                flat += (k, v)
+            return tuple(flat) if flat else None
+
+        metadata, extras = [], []
+        for item in items:
+            meta = item.get("metadata")
+            metadata.append(pack(meta.items(), no_skip) if meta else None)
+            extras.append(pack(item.items(), hot))
+        return cls(
+            [item.get("id") for item in items],
+            [item.get("memory") or "" for item in items],
+            [item.get("score") for item in items],
+            metadata,
+            extras,
+        )
+
+    def _subset(self, indices: Sequence[int]) -> "MemoryResultSet":
+        return MemoryResultSet(
+            [self._ids[i] for i in indices],
+            [self._memories[i] for i in indices],
+            [self._scores[i] for i in indices],
+            [self._metadata[i] for i in indices],
+            [self._extras[i] for i in indices],
+        )
+
+    def __len__(self) -> int:
+        return len(self._memories)
+
+    def __bool__(self) -> bool:
+        return bool(self._memories)
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[MemoryHit, "MemoryResultSet"]:
+        if isinstance(index, slice):
+            return self._subset(range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("MemoryResultSet index out of range")
+        return MemoryHit(self, index)
+
+    def __iter__(self) -> Iterator[MemoryHit]:
+        for i in range(len(self)):
+            yield MemoryHit(self, i)
+
+    def iter_memories(self) -> Iterator[str]:
+        """Iterates over memory texts without creating a hit per row."""
+        return iter(self._memories)
+
+    def texts(self) -> List[str]:
+        """Projects the set to a plain list of memory texts."""
+        return list(self._memories)
+
+    def ids(self) -> List[Optional[str]]:
+        return list(self._ids)
+
+    def texts_containing(self, substring: str) -> List[str]:
+        """Returns the memory texts that contain `substring`."""
+        return [m for m in self._memories if substring in m]
+
+    def texts_with_prefix(self, prefix: str) -> List[str]:
+        """Returns the memory texts that start with `prefix`."""
+        return [m for m in self._memories if m.startswith(prefix)]
+
+    def filter_contains(self, substring: str) -> "MemoryResultSet":
+        """Returns the hits whose memory text contains `substring`."""
+        return self._subset([i for i, m in enumerate(self._memories) if substring in m])
+
+    def filter_prefix(self, prefix: str) -> "MemoryResultSet":
+        """Returns the hits whose memory text starts with `prefix`."""
+        return self._subset([i for i, m in enumerate(self._memories) if m.startswith(prefix)])
+
+    def first_containing(self, substring: str) -> Optional[MemoryHit]:
+        """Returns the first hit whose memory text contains `substring`, if any."""
+        for i, m in enumerate(self._memories):
+            if substring in m:
+                return MemoryHit(self, i)
+        return None
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        """Materializes every hit as a new dict."""
+        return [hit.to_dict() for hit in self]
+
+    def __repr__(self) -> str:
+        return f"MemoryResultSet({len(self)} hits)"
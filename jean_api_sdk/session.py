@@ -0,0 +1,358 @@
+import itertools
+import json
+import socket
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Callable, Dict, Optional
+from urllib.parse import urljoin, urlparse, parse_qs
+
+import requests
+
+PROTOCOL_VERSION = "2024-11-05"
+HANDSHAKE_METHODS = ("initialize", "notifications/initialized")
+
+class MCPError(Exception):
+    """Raised when the server answers a JSON-RPC call with an error object."""
+    def __init__(self, error: Dict[str, Any]):
+        self.code = error.get("code")
+        self.data = error.get("data")
+        super().__init__(f"{error.get('code')}: {error.get('message')}")
+
+class MCPSession:
+    """
+    A persistent MCP session over the SSE transport.
+
+    One long-lived event stream is opened per session. The `initialize`
+    handshake runs once, after which any number of threads can issue calls
+    concurrently: each call gets a unique JSON-RPC id, is POSTed to the
+    endpoint the server announced, and waits for the matching response to
+    arrive on the stream. Progress notifications for a call are routed to its
+    `on_progress` callback. If the stream drops, it is reopened with the last
+    seen event id so the server can replay anything that was missed.
+    """
+    def __init__(self, sse_url: str, headers: Optional[Dict[str, str]] = None,
+                 client_name: str = "jean-api-sdk", connect_timeout: float = 30,
+                 read_timeout: float = 300, reconnect_delay: float = 0.5, max_reconnect_delay: float = 30,
+                 reinitialize_attempts: int = 3):
+        self.sse_url = sse_url
+        self.headers = dict(headers or {})
+        self.headers.pop("Content-Type", None)
+        self.client_name = client_name
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnect_delay = max_reconnect_delay
+        self.reinitialize_attempts = reinitialize_attempts
+
+        self.http = requests.Session()
+        self.messages_url: Optional[str] = None
+        self.session_id: Optional[str] = None
+        self.server_info: Optional[Dict] = None
+        self.last_event_id: Optional[str] = None
+
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self._pending: Dict[Any, Future] = {}
+        self._progress: Dict[Any, Callable[[Dict], None]] = {}
+        self._endpoint_ready = threading.Event()
+        self._initialized_event = threading.Event()
+        self._init_error: Optional[BaseException] = None
+        self._stream_error: Optional[BaseException] = None
+        self._connect_done = threading.Event()
+        self._closed = threading.Event()
+        self._stream: Optional[requests.Response] = None
+        self._reader: Optional[threading.Thread] = None
+
+    # --- Lifecycle ---
+
+    def connect(self) -> "MCPSession":
+        """
+        Opens the event stream and performs the initialize handshake.
+        On failure the session is closed and the error is raised.
+        """
+        try:
+            if self._reader is None:
+                self._reader = threading.Thread(target=self._read_loop, name="mcp-session-reader", daemon=True)
+                self._reader.start()
+            if not self._connect_done.wait(self.connect_timeout):
+                raise TimeoutError(f"No endpoint event received from {self.sse_url}")
+            if self._stream_error is not None:
+                raise self._stream_error
+            if not self._initialized_event.is_set():
+                self._initialize()
+            return self
+        except BaseException:
+            self.close()
+            raise
+
+    def close(self):
+        """Closes the stream and fails any calls still waiting for a response."""
+        self._closed.set()
+        self._interrupt_stream()
+        self._fail_pending(ConnectionError("MCP session closed"))
+        self.http.close()
+
+    def __enter__(self) -> "MCPSession":
+        return self.connect()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _initialize(self):
+        self.server_info = self.call("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": self.client_name, "version": "1.0"},
+        }, timeout=self.connect_timeout)
+        self.notify("notifications/initialized")
+        self._init_error = None
+        self._initialized_event.set()
+
+    def _reinitialize(self):
+        delay = self.reconnect_delay
+        for _ in range(max(1, self.reinitialize_attempts)):
+            if self._closed.is_set():
+                return
+            try:
+                self._initialize()
+                return
+            except Exception as e:
+                error = e
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+        # Wake any callers waiting on the handshake so they fail instead of hanging.
+        self._init_error = error
+        self._initialized_event.set()
+
+    # --- Calls ---
+
+    def call(self, method: str, params: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+             on_progress: Optional[Callable[[Dict], None]] = None) -> Any:
+        """Sends a JSON-RPC request and blocks until its response arrives or `timeout` expires."""
+        request_id, future = self._send(method, params, on_progress)
+        try:
+            return future.result(timeout)
+        except FutureTimeoutError:
+            error = TimeoutError(f"No response to '{method}' within {timeout}s")
+            self._resolve(request_id, error=error)
+            raise error from None
+
+    def call_async(self, method: str, params: Optional[Dict[str, Any]] = None,
+                   on_progress: Optional[Callable[[Dict], None]] = None) -> Future:
+        """Sends a JSON-RPC request and returns a Future for its result."""
+        return self._send(method, params, on_progress)[1]
+
+    def _send(self, method: str, params: Optional[Dict[str, Any]],
+              on_progress: Optional[Callable[[Dict], None]]):
+        if self._closed.is_set():
+            raise ConnectionError("MCP session closed")
+        request_id = next(self._ids)
+        params = dict(params or {})
+        future: Future = Future()
+        try:
+            # Register only once the session can take the call, so a session that is
+            # replaced while we wait does not fail a request it never received.
+            self._wait_ready(method)
+        except Exception as e:
+            future.set_exception(e)
+            return request_id, future
+        with self._lock:
+            self._pending[request_id] = future
+            if on_progress is not None:
+                self._progress[request_id] = on_progress
+                params["_meta"] = {**params.get("_meta", {}), "progressToken": request_id}
+        try:
+            self._post({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params})
+        except Exception as e:
+            self._resolve(request_id, error=e)
+        return request_id, future
+
+    def notify(self, method: str, params: Optional[Dict[str, Any]] = None):
+        """Sends a JSON-RPC notification (no response expected)."""
+        message = {"jsonrpc": "2.0", "method": method}
+        if params:
+            message["params"] = params
+        self._wait_ready(method)
+        self._post(message)
+
+    def _wait_ready(self, method: str):
+        # Wait for the endpoint first: a replaced session clears the initialized
+        # flag before its endpoint is published, so the check below sees it.
+        if not self._endpoint_ready.wait(self.connect_timeout):
+            raise TimeoutError("MCP session has no message endpoint")
+        if method not in HANDSHAKE_METHODS:
+            # Only the handshake itself may be sent before the session is initialized.
+            if not self._initialized_event.wait(self.connect_timeout):
+                raise TimeoutError("MCP session is not initialized")
+            if self._init_error is not None:
+                raise ConnectionError(f"MCP session re-initialization failed: {self._init_error}")
+
+    def _post(self, message: Dict[str, Any]):
+        headers = {**self.headers, "Content-Type": "application/json"}
+        if self.session_id:
+            headers["Mcp-Session-Id"] = self.session_id
+        headers["Accept"] = "application/json, text/event-stream"
+        with self.http.post(self.messages_url, headers=headers, data=json.dumps(message), stream=True,
+                            timeout=(self.connect_timeout, self.read_timeout)) as response:
+            response.raise_for_status()
+            # Servers may answer inline instead of over the session stream: either a JSON
+            # body, or (streamable HTTP) an SSE stream carrying progress and the response.
+            content_type = response.headers.get("Content-Type", "")
+            if content_type.startswith("text/event-stream"):
+                response.encoding = "utf-8"
+                for event, data, _ in self._iter_events(response):
+                    if event == "message":
+                        self._handle_message(data)
+            elif response.status_code == 202 or not response.content:
+                return
+            elif content_type.startswith("application/json"):
+                self._handle_message(response.text)
+            else:
+                raise ConnectionError(f"Unexpected response content type '{content_type}' for "
+                                      f"'{message.get('method')}'")
+
+    # --- Stream handling ---
+
+    def _read_loop(self):
+        delay = self.reconnect_delay
+        while not self._closed.is_set():
+            try:
+                self._open_stream()
+                delay = self.reconnect_delay
+                self._consume_stream()
+            except requests.exceptions.HTTPError as e:
+                status = e.response.status_code
+                # A client error before the first endpoint (e.g. bad URL) or an auth
+                # failure at any point will not fix itself by retrying.
+                if 400 <= status < 500 and (not self._connect_done.is_set() or status in (401, 403)):
+                    self._stop_reader(e)
+                    break
+            except Exception:
+                pass
+            finally:
+                self._endpoint_ready.clear()
+                if self._stream is not None:
+                    self._stream.close()
+            if self._closed.is_set():
+                break
+            time.sleep(delay)
+            delay = min(delay * 2, self.max_reconnect_delay)
+
+    def _open_stream(self):
+        headers = {**self.headers, "Accept": "text/event-stream", "Cache-Control": "no-cache"}
+        if self.last_event_id is not None:
+            headers["Last-Event-ID"] = self.last_event_id
+        if self.session_id:
+            headers["Mcp-Session-Id"] = self.session_id
+        self._stream = self.http.get(self.sse_url, headers=headers, stream=True,
+                                     timeout=(self.connect_timeout, self.read_timeout))
+        self._stream.raise_for_status()
+        self._stream.encoding = "utf-8"
+
+    def _stop_reader(self, error: BaseException):
+        self._stream_error = error
+        self._closed.set()
+        self._connect_done.set()
+        self._fail_pending(ConnectionError(f"MCP session stream failed: {error}"))
+
+    def _interrupt_stream(self):
+        # Closing the response from another thread blocks on the reader's lock,
+        # so shut the socket down instead and let the reader clean up.
+        connection = getattr(getattr(self._stream, "raw", None), "_connection", None)
+        sock = getattr(connection, "sock", None)
+        if sock is not None:
+            try:
+                sock.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    def _consume_stream(self):
+        for event, data, event_id in self._iter_events(self._stream):
+            if event_id is not None:
+                self.last_event_id = event_id
+            try:
+                self._handle_event(event, data)
+            except Exception as e:
+                # A bad event must not tear down the stream (and with it every in-flight call).
+                print(f"⚠️ Ignoring MCP '{event}' event that could not be handled: {e}")
+
+    @staticmethod
+    def _iter_events(response: requests.Response):
+        """Parses a server-sent events body into (event, data, id) tuples."""
+        event, data, event_id = "message", [], None
+        for line in response.iter_lines(chunk_size=None, decode_unicode=True):
+            if line:
+                if line.startswith(":"):
+                    continue
+                field, _, value = line.partition(":")
+                value = value[1:] if value.startswith(" ") else value
+                if field == "event":
+                    event = value
+                elif field == "data":
+                    data.append(value)
+                elif field == "id":
+                    event_id = value
+                continue
+            if data:
+                yield event, "\n".join(data), event_id
+            event, data, event_id = "message", [], None
+
+    def _handle_event(self, event: str, data: str):
+        if event == "endpoint":
+            messages_url = urljoin(self.sse_url, data)
+            session_id = (parse_qs(urlparse(messages_url).query).get("session_id", [None])[0]
+                          or self._stream.headers.get("Mcp-Session-Id"))
+            resumed = session_id == self.session_id
+            self.messages_url = messages_url
+            self.session_id = session_id
+            if self._initialized_event.is_set() and not resumed:
+                # The server did not resume our session: responses to in-flight calls
+                # are lost, so fail them and handshake again before anything else is sent.
+                self._initialized_event.clear()
+                self._fail_pending(ConnectionError("MCP session was not resumed"))
+                threading.Thread(target=self._reinitialize, daemon=True).start()
+            self._endpoint_ready.set()
+            self._connect_done.set()
+        elif event == "message":
+            self._handle_message(data)
+
+    def _handle_message(self, data: str):
+        message = json.loads(data)
+        for item in message if isinstance(message, list) else [message]:
+            self._dispatch(item)
+
+    def _dispatch(self, message: Dict[str, Any]):
+        if message.get("method") == "notifications/progress":
+            params = message.get("params", {})
+            with self._lock:
+                callback = self._progress.get(params.get("progressToken"))
+            if callback is not None:
+                try:
+                    callback(params)
+                except Exception as e:
+                    print(f"⚠️ on_progress callback raised an error: {e}")
+        elif "id" in message and ("result" in message or "error" in message):
+            if "error" in message:
+                self._resolve(message["id"], error=MCPError(message["error"]))
+            else:
+                self._resolve(message["id"], result=message["result"])
+
+    def _fail_pending(self, error: BaseException):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._progress.clear()
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    def _resolve(self, request_id: Any, result: Any = None, error: Optional[BaseException] = None):
+        with self._lock:
+            future = self._pending.pop(request_id, None)
+            self._progress.pop(request_id, None)
+        if future is None or future.done():
+            return
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)